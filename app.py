@@ -1,99 +1,166 @@
 import os
 import psycopg2
 import psycopg2.extras # Necesario para RealDictCursor
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, current_app, request, jsonify
 from dotenv import load_dotenv
 import logging
-from groq import Groq # Importar la clase Groq
+import sessions
+from resources import AppResources
+
+GROQ_MODEL = "llama3-8b-8192" # Modelo usado para generar texto
+
+# Todas las rutas de la API; se registran en la aplicación dentro de create_app()
+api = Blueprint('api', __name__)
+
+
+def load_config():
+    """Lee la configuración de la aplicación de las variables de entorno (y del archivo .env)."""
+    load_dotenv()
+    return {
+        # Configuración de la base de datos
+        # Se prefiere DATABASE_URL si está disponible (común en Render)
+        'DB_URL': os.getenv('DB_URL'),
+        'DB_NAME': os.getenv('DB_NAME'),
+        'DB_USER': os.getenv('DB_USER'),
+        'DB_PASSWORD': os.getenv('DB_PASSWORD'),
+        'DB_HOST': os.getenv('DB_HOST'),
+        'DB_PORT': os.getenv('DB_PORT'),
+        # Tamaño del pool de conexiones de cada worker. Por defecto el mínimo es igual al máximo:
+        # psycopg2 cierra cada conexión devuelta por encima del mínimo y habría que reabrirla
+        'DB_POOL_MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', 5)),
+        'DB_POOL_MIN_SIZE': int(os.getenv('DB_POOL_MIN_SIZE', os.getenv('DB_POOL_MAX_SIZE', 5))),
+        # Segundos máximos para establecer cada conexión con PostgreSQL
+        'DB_CONNECT_TIMEOUT': int(os.getenv('DB_CONNECT_TIMEOUT', 5)),
+        # Segundos que una petición espera por una conexión libre del pool
+        'DB_POOL_TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'GROQ_API_KEY': os.getenv('GROQ_API_KEY'),
+        # Configuración de las sesiones de conversación
+        # Presupuesto aproximado de tokens para el historial (resumen + turnos recientes + prompt)
+        'SESSION_HISTORY_TOKEN_BUDGET': int(os.getenv('SESSION_HISTORY_TOKEN_BUDGET', 2000)),
+        'SESSION_SUMMARY_MAX_TOKENS': int(os.getenv('SESSION_SUMMARY_MAX_TOKENS', 300)),
+        # Número de conversaciones activas que se mantienen en memoria
+        'SESSION_CACHE_SIZE': int(os.getenv('SESSION_CACHE_SIZE', 256)),
+    }
+
+
+def create_app(config=None):
+    """
+    Crea y configura la aplicación Flask.
+    Los recursos costosos (cliente Groq, pool de la base de datos) no se crean aquí, sino la
+    primera vez que se usan o al precalentar con get_resources().start_warmup().
+    """
+    app = Flask(__name__)
 
-# Cargar variables de entorno desde .env
-load_dotenv()
+    # Configurar el nivel de log para la aplicación Flask
+    app.logger.setLevel(logging.INFO)
 
-app = Flask(__name__)
+    app.config.update(load_config())
+    if config:
+        app.config.update(config)
 
-# Configurar el nivel de log para la aplicación Flask
-app.logger.setLevel(logging.INFO)
+    app.extensions['resources'] = AppResources(app.config, app.logger)
+    app.register_blueprint(api)
+    return app
 
-# Configuración de la base de datos
-# Se prefiere DATABASE_URL si está disponible (común en Render)
-DB_URL = os.getenv('DB_URL')
-DB_NAME = os.getenv('DB_NAME')
-DB_USER = os.getenv('DB_USER')
-DB_PASSWORD = os.getenv('DB_PASSWORD')
-DB_HOST = os.getenv('DB_HOST')
-DB_PORT = os.getenv('DB_PORT')
 
-# Inicialización del cliente Groq
-GROQ_API_KEY = os.getenv('GROQ_API_KEY')
-groq_client = None
-if GROQ_API_KEY:
-    try:
-        groq_client = Groq(api_key=GROQ_API_KEY)
-        app.logger.info("Cliente Groq inicializado correctamente.")
-    except Exception as e:
-        app.logger.error(f"Error al inicializar el cliente Groq: {e}")
-        groq_client = None
-else:
-    app.logger.warning("GROQ_API_KEY no está configurada. La integración con Groq no funcionará.")
+def get_resources(app=None):
+    """Devuelve los recursos de la aplicación indicada o de la aplicación actual."""
+    return (app or current_app).extensions['resources']
 
 
 def get_db_connection():
-    """Establece y devuelve una conexión a la base de datos."""
-    conn = None
-    try:
-        if DB_URL:
-            conn = psycopg2.connect(DB_URL)
-            app.logger.info("Conexión a la base de datos exitosa usando DATABASE_URL!")
-        else:
-            conn = psycopg2.connect(
-                dbname=DB_NAME,
-                user=DB_USER,
-                password=DB_PASSWORD,
-                host=DB_HOST,
-                port=DB_PORT
-            )
-            app.logger.info("Conexión a la base de datos exitosa usando variables individuales!")
-        return conn
-    except Exception as e:
-        app.logger.error(f"Error al conectar a la base de datos: {e}")
-        return None
+    """Obtiene una conexión a la base de datos del pool de la aplicación."""
+    return get_resources().get_connection()
+
+def release_db_connection(conn):
+    """Devuelve al pool una conexión obtenida con get_db_connection()."""
+    get_resources().release_connection(conn)
 
-def log_llm_interaction(prompt, response, model, ip_address):
+def log_llm_interaction(prompt, response, model, ip_address, session_id=None, conn=None):
     """
     Registra la interacción del LLM en la base de datos.
+    Si la interacción pertenece a una sesión de conversación se guarda también su ID.
+    Si se pasa 'conn' se usa esa conexión (sin devolverla al pool) en lugar de pedir otra.
     """
-    conn = None
+    own_conn = conn is None
     try:
-        conn = get_db_connection()
+        if own_conn:
+            conn = get_db_connection()
         if conn is None:
-            app.logger.error("No se pudo obtener conexión a la base de datos para registrar la interacción LLM.")
+            current_app.logger.error("No se pudo obtener conexión a la base de datos para registrar la interacción LLM.")
             return
 
         cur = conn.cursor()
-        sql_insert_log = """
-            INSERT INTO llm_interactions_log (user_prompt, llm_response, model_used, ip_address)
-            VALUES (%s, %s, %s, %s);
-        """
-        cur.execute(sql_insert_log, (prompt, response, model, ip_address))
+        if session_id is None:
+            sql_insert_log = """
+                INSERT INTO llm_interactions_log (user_prompt, llm_response, model_used, ip_address)
+                VALUES (%s, %s, %s, %s);
+            """
+            cur.execute(sql_insert_log, (prompt, response, model, ip_address))
+        else:
+            sql_insert_log = """
+                INSERT INTO llm_interactions_log (user_prompt, llm_response, model_used, ip_address, session_id)
+                VALUES (%s, %s, %s, %s, %s);
+            """
+            cur.execute(sql_insert_log, (prompt, response, model, ip_address, session_id))
         conn.commit()
         cur.close()
-        app.logger.info(f"Interacción LLM registrada: Prompt '{prompt[:50]}...'")
+        current_app.logger.info(f"Interacción LLM registrada: Prompt '{prompt[:50]}...'")
     except psycopg2.errors.UndefinedTable:
-        app.logger.error("ERROR: La tabla 'llm_interactions_log' no existe. No se pudo registrar la interacción LLM.")
+        current_app.logger.error("ERROR: La tabla 'llm_interactions_log' no existe. No se pudo registrar la interacción LLM.")
     except Exception as e:
         if conn:
             conn.rollback()
-        app.logger.error(f"ERROR: No se pudo registrar la interacción LLM en la base de datos: {e}")
+        current_app.logger.error(f"ERROR: No se pudo registrar la interacción LLM en la base de datos: {e}")
     finally:
-        if conn:
-            conn.close()
+        if own_conn and conn:
+            release_db_connection(conn)
 
-@app.route("/", methods = ['GET'])
+def get_pagination_params(args):
+    """
+    Lee los parámetros opcionales de paginación 'limit' y 'offset' de la query string ('args').
+    Devuelve (limit, offset, error). Si no se envía 'limit' se devuelven todos los registros.
+    """
+    raw_limit = args.get('limit')
+    raw_offset = args.get('offset', '0')
+    try:
+        limit = int(raw_limit) if raw_limit else None
+        offset = int(raw_offset) if raw_offset else 0
+    except ValueError:
+        return None, None, "Los parámetros 'limit' y 'offset' deben ser enteros"
+    if (limit is not None and limit < 0) or offset < 0:
+        return None, None, "Los parámetros 'limit' y 'offset' no pueden ser negativos"
+    return limit, offset, None
+
+@api.route("/", methods = ['GET'])
 def inicio():
     return "Inicio de la API de designers"
 
-@app.route('/designers', methods=['GET'])
+@api.route('/healthz', methods=['GET'])
+def liveness():
+    """
+    Liveness: el proceso está vivo y atiende peticiones. No depende de recursos externos.
+    """
+    return jsonify({"status": "ok"})
+
+@api.route('/readyz', methods=['GET'])
+def readiness():
+    """
+    Readiness: devuelve 200 solo cuando el precalentamiento de recursos ha terminado.
+    Mientras tanto devuelve 503 y, si el precalentamiento no está en curso, lo lanza.
+    """
+    resources = get_resources()
+    if resources.ready.is_set():
+        return jsonify({"status": "ready"})
+    resources.start_warmup()
+    return jsonify({"status": "warming_up"}), 503
+
+@api.route('/designers', methods=['GET'])
 def get_designers():
+    limit, offset, error = get_pagination_params(request.args)
+    if error:
+        return jsonify({"error": error}), 400
+
     conn = None
     try:
         conn = get_db_connection()
@@ -101,21 +168,25 @@ def get_designers():
             return jsonify({"error": "No se pudo conectar a la base de datos"}), 500
 
         cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-        cur.execute("SELECT id, name, nationality, style, famous_works, website FROM designers ORDER BY name ASC;")
+        # LIMIT NULL equivale a no limitar, así se mantiene el comportamiento sin paginación
+        cur.execute(
+            "SELECT id, name, nationality, style, famous_works, website FROM designers ORDER BY name ASC, id ASC LIMIT %s OFFSET %s;",
+            (limit, offset)
+        )
         designers = cur.fetchall()
         cur.close()
         return jsonify(designers)
     except psycopg2.errors.UndefinedTable:
-        app.logger.error("Error al obtener diseñadores: La tabla 'designers' no existe.")
+        current_app.logger.error("Error al obtener diseñadores: La tabla 'designers' no existe.")
         return jsonify({"error": "No se pudieron obtener los diseñadores", "details": "La tabla 'designers' no existe"}), 500
     except Exception as e:
-        app.logger.error(f"Error al obtener diseñadores: {e}")
+        current_app.logger.error(f"Error al obtener diseñadores: {e}")
         return jsonify({"error": "No se pudieron obtener los diseñadores", "details": str(e)}), 500
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
-@app.route('/designers/<int:designer_id>', methods=['GET'])
+@api.route('/designers/<int:designer_id>', methods=['GET'])
 def get_designer_by_id(designer_id):
     conn = None
     try:
@@ -132,16 +203,16 @@ def get_designer_by_id(designer_id):
         else:
             return jsonify({"message": "Diseñador no encontrado"}), 404
     except psycopg2.errors.UndefinedTable:
-        app.logger.error("Error al obtener diseñador por ID: La tabla 'designers' no existe.")
+        current_app.logger.error("Error al obtener diseñador por ID: La tabla 'designers' no existe.")
         return jsonify({"error": "No se pudo obtener el diseñador", "details": "La tabla 'designers' no existe"}), 500
     except Exception as e:
-        app.logger.error(f"Error al obtener diseñador por ID: {e}")
+        current_app.logger.error(f"Error al obtener diseñador por ID: {e}")
         return jsonify({"error": "No se pudo obtener el diseñador", "details": str(e)}), 500
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
-@app.route('/designers/search', methods=['GET'])
+@api.route('/designers/search', methods=['GET'])
 def search_designers():
     query = request.args.get('query', '').lower()
     if not query:
@@ -166,16 +237,16 @@ def search_designers():
         cur.close()
         return jsonify(designers)
     except psycopg2.errors.UndefinedTable:
-        app.logger.error("Error al buscar diseñadores: La tabla 'designers' no existe.")
+        current_app.logger.error("Error al buscar diseñadores: La tabla 'designers' no existe.")
         return jsonify({"error": "No se pudo realizar la búsqueda", "details": "La tabla 'designers' no existe"}), 500
     except Exception as e:
-        app.logger.error(f"Error al buscar diseñadores: {e}")
+        current_app.logger.error(f"Error al buscar diseñadores: {e}")
         return jsonify({"error": "No se pudo realizar la búsqueda", "details": str(e)}), 500
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
-@app.route("/designers", methods=['POST'])
+@api.route("/designers", methods=['POST'])
 def add_designer():
     conn = None
     try:
@@ -218,31 +289,32 @@ def add_designer():
     except psycopg2.errors.UndefinedTable:
         if conn:
             conn.rollback()
-        app.logger.error("Error de base de datos al añadir diseñador: La tabla 'designers' no existe.")
+        current_app.logger.error("Error de base de datos al añadir diseñador: La tabla 'designers' no existe.")
         return jsonify({"error": "Error de base de datos al añadir diseñador", "details": "La tabla 'designers' no existe"}), 500
     except psycopg2.Error as db_err:
         if conn:
             conn.rollback()
-        app.logger.error(f"Error de base de datos al añadir diseñador: {db_err}")
+        current_app.logger.error(f"Error de base de datos al añadir diseñador: {db_err}")
         return jsonify({"error": "Error de base de datos al añadir diseñador", "details": str(db_err)}), 500
     except Exception as e:
         if conn:
             conn.rollback()
-        app.logger.error(f"Error inesperado al añadir diseñador: {e}")
+        current_app.logger.error(f"Error inesperado al añadir diseñador: {e}")
         return jsonify({"error": "No se pudo añadir el diseñador", "details": str(e)}), 500
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
-@app.route('/generate_text', methods=['POST'])
+@api.route('/generate_text', methods=['POST'])
 def generate_text_with_llm():
     """
     Endpoint para generar texto usando un LLM (Groq).
     Recibe un prompt en el cuerpo de la solicitud JSON.
     Registra la interacción en la base de datos.
     """
+    groq_client = get_resources().groq_client()
     if groq_client is None: # Cambiado de 'not groq_client' a 'groq_client is None' para mayor claridad
-        app.logger.error("La integración con Groq no está configurada. Falta GROQ_API_KEY o hubo un error de inicialización.")
+        current_app.logger.error("La integración con Groq no está configurada. Falta GROQ_API_KEY o hubo un error de inicialización.")
         return jsonify({"error": "La integración con Groq no está configurada. Falta GROQ_API_KEY o hubo un error de inicialización."}), 503
 
     try:
@@ -256,7 +328,7 @@ def generate_text_with_llm():
         ip_address = request.remote_addr or request.headers.get('X-Forwarded-For', 'N/A')
 
         # Llamada a la API de Groq
-        model_name = "llama3-8b-8192" # Define el modelo aquí
+        model_name = GROQ_MODEL
         chat_completion = groq_client.chat.completions.create(
             messages=[
                 {
@@ -275,15 +347,248 @@ def generate_text_with_llm():
         return jsonify({"generated_text": llm_response})
 
     except Exception as e:
-        app.logger.error(f"Error al generar texto con Groq: {e}")
+        current_app.logger.error(f"Error al generar texto con Groq: {e}")
         return jsonify({"error": "No se pudo generar texto con el LLM", "details": str(e)}), 500
 
+def load_conversation_state(conn, session_id):
+    """
+    Devuelve una copia del estado de la conversación, usando la caché en memoria si está al día
+    con la base de datos. Devuelve None si la conversación no existe.
+    """
+    cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+    cur.execute("SELECT id, summary, summarized_turns, turn_count FROM conversations WHERE id = %s;", (session_id,))
+    conversation = cur.fetchone()
+    if conversation is None:
+        cur.close()
+        get_resources().session_cache.discard(session_id)
+        return None
+
+    # La caché solo es válida si nadie (p. ej. otro worker) ha modificado la conversación
+    state = get_resources().session_cache.get(session_id)
+    if (state is not None and state.turn_count == conversation['turn_count']
+            and state.summarized_turns == conversation['summarized_turns']):
+        cur.close()
+        return state.copy()
+
+    cur.execute(
+        "SELECT user_message, assistant_message FROM conversation_turns WHERE conversation_id = %s ORDER BY id ASC OFFSET %s;",
+        (session_id, conversation['summarized_turns'])
+    )
+    turns = [(row['user_message'], row['assistant_message']) for row in cur.fetchall()]
+    cur.close()
+    state = sessions.ConversationState(session_id, conversation['summary'], conversation['summarized_turns'], turns)
+    get_resources().session_cache.put(state)
+    return state.copy()
+
+def summarize_old_turns(groq_client, state, prompt):
+    """
+    Condensa en el resumen de la conversación los turnos que ya no caben en la ventana de historial,
+    para que no haya que volver a enviarlos ni a resumirlos. Solo modifica 'state'; el resumen se
+    guarda junto con el turno en save_session_turn().
+    """
+    count = sessions.turns_to_summarize(state, prompt, current_app.config['SESSION_HISTORY_TOKEN_BUDGET'])
+    if not count:
+        return
+
+    chat_completion = groq_client.chat.completions.create(
+        messages=sessions.build_summary_messages(state.summary, state.turns[:count]),
+        model=GROQ_MODEL,
+        max_tokens=current_app.config['SESSION_SUMMARY_MAX_TOKENS'],
+    )
+    state.summary = chat_completion.choices[0].message.content
+    state.summarized_turns += count
+    state.turns = state.turns[count:]
+    current_app.logger.info(f"Sesión {state.session_id}: {count} turnos condensados en el resumen.")
+
+def save_session_turn(conn, state, expected_turn_count, expected_summarized_turns, prompt, llm_response):
+    """
+    Guarda el nuevo turno y el resumen de 'state' solo si la conversación no ha cambiado desde que
+    se leyó (mismos contadores). Devuelve False, sin guardar nada, si otra petición se adelantó.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        UPDATE conversations
+        SET summary = %s, summarized_turns = %s, turn_count = turn_count + 1, updated_at = CURRENT_TIMESTAMP
+        WHERE id = %s AND turn_count = %s AND summarized_turns = %s;
+        """,
+        (state.summary, state.summarized_turns, state.session_id, expected_turn_count, expected_summarized_turns)
+    )
+    if cur.rowcount == 0:
+        cur.close()
+        conn.rollback()
+        return False
+    cur.execute(
+        "INSERT INTO conversation_turns (conversation_id, user_message, assistant_message) VALUES (%s, %s, %s);",
+        (state.session_id, prompt, llm_response)
+    )
+    conn.commit()
+    cur.close()
+    return True
+
+@api.route('/sessions', methods=['POST'])
+def create_session():
+    """
+    Crea una nueva sesión de conversación con el LLM.
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return jsonify({"error": "No se pudo conectar a la base de datos"}), 500
+
+        cur = conn.cursor()
+        cur.execute("INSERT INTO conversations DEFAULT VALUES RETURNING id;")
+        session_id = cur.fetchone()[0]
+        conn.commit()
+        cur.close()
+
+        get_resources().session_cache.put(sessions.ConversationState(session_id))
+        return jsonify({"message": "Sesión creada con éxito", "session_id": session_id}), 201
+    except psycopg2.errors.UndefinedTable:
+        if conn:
+            conn.rollback()
+        current_app.logger.error("Error al crear la sesión: La tabla 'conversations' no existe.")
+        return jsonify({"error": "No se pudo crear la sesión", "details": "La tabla 'conversations' no existe"}), 500
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        current_app.logger.error(f"Error al crear la sesión: {e}")
+        return jsonify({"error": "No se pudo crear la sesión", "details": str(e)}), 500
+    finally:
+        if conn:
+            release_db_connection(conn)
+
+@api.route('/sessions/<int:session_id>', methods=['GET'])
+def get_session(session_id):
+    """
+    Obtiene una sesión de conversación con su resumen y el historial completo de turnos.
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return jsonify({"error": "No se pudo conectar a la base de datos"}), 500
+
+        cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        cur.execute("SELECT id, summary, created_at, updated_at FROM conversations WHERE id = %s;", (session_id,))
+        conversation = cur.fetchone()
+        if conversation is None:
+            cur.close()
+            return jsonify({"message": "Sesión no encontrada"}), 404
+
+        cur.execute(
+            "SELECT id, user_message, assistant_message, timestamp FROM conversation_turns WHERE conversation_id = %s ORDER BY id ASC;",
+            (session_id,)
+        )
+        turns = cur.fetchall()
+        cur.close()
+        return jsonify({
+            "session_id": conversation['id'],
+            "summary": conversation['summary'],
+            "created_at": conversation['created_at'],
+            "updated_at": conversation['updated_at'],
+            "turns": turns
+        })
+    except psycopg2.errors.UndefinedTable:
+        current_app.logger.error("Error al obtener la sesión: Las tablas de sesiones no existen.")
+        return jsonify({"error": "No se pudo obtener la sesión", "details": "Las tablas 'conversations' y 'conversation_turns' no existen"}), 500
+    except Exception as e:
+        current_app.logger.error(f"Error al obtener la sesión: {e}")
+        return jsonify({"error": "No se pudo obtener la sesión", "details": str(e)}), 500
+    finally:
+        if conn:
+            release_db_connection(conn)
+
+@api.route('/sessions/<int:session_id>/messages', methods=['POST'])
+def send_session_message(session_id):
+    """
+    Envía un mensaje dentro de una sesión de conversación.
+    El LLM recibe el resumen de los turnos antiguos y una ventana de los turnos recientes
+    limitada por SESSION_HISTORY_TOKEN_BUDGET. El turno se guarda en la sesión y se registra
+    en llm_interactions_log con el ID de la sesión.
+
+    No se mantiene ninguna conexión ni bloqueo durante las llamadas al LLM: si otro mensaje de la
+    misma sesión se guarda antes, este no se guarda y se devuelve 409 para que el cliente lo reenvíe.
+    """
+    groq_client = get_resources().groq_client()
+    if groq_client is None:
+        current_app.logger.error("La integración con Groq no está configurada. Falta GROQ_API_KEY o hubo un error de inicialización.")
+        return jsonify({"error": "La integración con Groq no está configurada. Falta GROQ_API_KEY o hubo un error de inicialización."}), 503
+
+    conn = None
+    try:
+        data = request.get_json()
+        prompt = data.get('prompt')
+
+        if not prompt:
+            return jsonify({"error": "Parámetro 'prompt' requerido en el cuerpo de la solicitud."}), 400
+
+        # Obtener la IP del cliente (para el registro)
+        ip_address = request.remote_addr or request.headers.get('X-Forwarded-For', 'N/A')
+
+        conn = get_db_connection()
+        if conn is None:
+            return jsonify({"error": "No se pudo conectar a la base de datos"}), 500
+
+        state = load_conversation_state(conn, session_id)
+        # La conexión se devuelve al pool antes de esperar al LLM, para no ocuparla durante la llamada
+        release_db_connection(conn)
+        conn = None
+        if state is None:
+            return jsonify({"message": "Sesión no encontrada"}), 404
+        expected_turn_count, expected_summarized_turns = state.turn_count, state.summarized_turns
+
+        summarize_old_turns(groq_client, state, prompt)
+
+        chat_completion = groq_client.chat.completions.create(
+            messages=sessions.build_messages(state, prompt),
+            model=GROQ_MODEL,
+        )
+        llm_response = chat_completion.choices[0].message.content
+
+        conn = get_db_connection()
+        if conn is None:
+            return jsonify({"error": "No se pudo conectar a la base de datos"}), 500
+
+        if not save_session_turn(conn, state, expected_turn_count, expected_summarized_turns, prompt, llm_response):
+            current_app.logger.warning(f"Sesión {session_id}: modificada por otra petición mientras se generaba la respuesta.")
+            return jsonify({"error": "La sesión se ha modificado mientras se generaba la respuesta. Vuelve a enviar el mensaje."}), 409
+
+        # Solo tras el commit el nuevo estado pasa a la caché compartida
+        state.turns.append((prompt, llm_response))
+        get_resources().session_cache.put(state)
+
+        # Registrar la interacción en la base de datos
+        log_llm_interaction(prompt, llm_response, GROQ_MODEL, ip_address, session_id, conn=conn)
+
+        return jsonify({"session_id": session_id, "generated_text": llm_response})
+
+    except psycopg2.errors.UndefinedTable:
+        if conn:
+            conn.rollback()
+        current_app.logger.error("Error en la sesión de conversación: Las tablas de sesiones no existen.")
+        return jsonify({"error": "No se pudo generar texto con el LLM", "details": "Las tablas 'conversations' y 'conversation_turns' no existen"}), 500
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        current_app.logger.error(f"Error al generar texto con Groq en la sesión {session_id}: {e}")
+        return jsonify({"error": "No se pudo generar texto con el LLM", "details": str(e)}), 500
+    finally:
+        if conn:
+            release_db_connection(conn)
+
 # Endpoint para obtener el historial de interacciones LLM
-@app.route('/logs', methods=['GET'])
+@api.route('/logs', methods=['GET'])
 def get_llm_logs():
     """
     Obtiene el historial de interacciones del LLM de la base de datos.
+    Admite paginación opcional con los parámetros 'limit' y 'offset'.
     """
+    limit, offset, error = get_pagination_params(request.args)
+    if error:
+        return jsonify({"error": error}), 400
+
     conn = None
     try:
         conn = get_db_connection()
@@ -292,22 +597,28 @@ def get_llm_logs():
 
         cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
         # Ordena por timestamp descendente para ver los más recientes primero
-        cur.execute("SELECT id, user_prompt, llm_response, model_used, timestamp, ip_address FROM llm_interactions_log ORDER BY timestamp DESC;")
+        cur.execute(
+            "SELECT id, user_prompt, llm_response, model_used, timestamp, ip_address FROM llm_interactions_log ORDER BY timestamp DESC, id DESC LIMIT %s OFFSET %s;",
+            (limit, offset)
+        )
         logs = cur.fetchall()
         cur.close()
         return jsonify(logs)
     except psycopg2.errors.UndefinedTable:
-        app.logger.error("Error al obtener logs de interacciones LLM: La tabla 'llm_interactions_log' no existe.")
+        current_app.logger.error("Error al obtener logs de interacciones LLM: La tabla 'llm_interactions_log' no existe.")
         return jsonify({"error": "No se pudieron obtener los logs de interacciones LLM", "details": "La tabla 'llm_interactions_log' no existe"}), 500
     except Exception as e:
-        app.logger.error(f"Error al obtener logs de interacciones LLM: {e}")
+        current_app.logger.error(f"Error al obtener logs de interacciones LLM: {e}")
         return jsonify({"error": "No se pudieron obtener los logs de interacciones LLM", "details": str(e)}), 500
     finally:
         if conn:
-            conn.close()
+            release_db_connection(conn)
 
 
 if __name__ == '__main__':
+    # Servidor de desarrollo. En producción se usa gunicorn (ver gunicorn.conf.py)
+    app = create_app()
+    get_resources(app).start_warmup()
     # Configurar el puerto para Render o desarrollo local
     port = int(os.environ.get("PORT", 5000))
-    app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=port, debug=True)
@@ -0,0 +1,250 @@
+"""
+Modo de ejecución asíncrono (ASGI) de la API.
+
+Las rutas de generación de texto (/generate_text) y de historial (/logs) se atienden de forma
+nativamente asíncrona con el cliente AsyncGroq y un pool de conexiones asyncpg, de modo que
+una petición que espera al LLM no ocupa un hilo del sistema operativo. El resto de rutas
+(catálogo de diseñadores) se delegan a la aplicación Flask de app.py, que se ejecuta en un
+pool de hilos y sigue respondiendo mientras hay generaciones en curso.
+
+Ejecución:
+    uvicorn app_async:app --host 0.0.0.0 --port 5000
+"""
+import asyncio
+import contextlib
+import os
+
+import asyncpg
+from a2wsgi import WSGIMiddleware
+from groq import AsyncGroq
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+
+from app import GROQ_MODEL, create_app, get_pagination_params, get_resources
+
+flask_app = create_app()
+
+# Número de hilos para las rutas que atiende la aplicación Flask
+WSGI_THREADS = int(os.getenv('WSGI_THREADS', 10))
+
+# Recursos asíncronos; se crean de forma diferida y se reintentan si fallan (ver get_db_pool)
+groq_client = None
+db_pool = None
+db_pool_lock = asyncio.Lock()
+db_pool_task = None
+
+
+class FlaskJSONResponse(Response):
+    """Respuesta JSON serializada igual que jsonify (mismo orden de claves y formato de fechas)."""
+    media_type = "application/json"
+
+    def render(self, content):
+        # Se usa el mismo proveedor que jsonify, que además fija los separadores compactos
+        return flask_app.json.response(content).get_data()
+
+
+async def create_db_pool():
+    """Crea el pool de conexiones asíncronas a la base de datos. Devuelve None si no se puede conectar."""
+    config = flask_app.config
+    try:
+        if config['DB_URL']:
+            pool = await asyncpg.create_pool(
+                dsn=config['DB_URL'],
+                min_size=config['DB_POOL_MIN_SIZE'],
+                max_size=config['DB_POOL_MAX_SIZE'],
+                timeout=config['DB_CONNECT_TIMEOUT']
+            )
+        else:
+            pool = await asyncpg.create_pool(
+                database=config['DB_NAME'],
+                user=config['DB_USER'],
+                password=config['DB_PASSWORD'],
+                host=config['DB_HOST'],
+                port=int(config['DB_PORT']) if config['DB_PORT'] else None,
+                min_size=config['DB_POOL_MIN_SIZE'],
+                max_size=config['DB_POOL_MAX_SIZE'],
+                timeout=config['DB_CONNECT_TIMEOUT']
+            )
+        flask_app.logger.info("Pool de conexiones asíncronas a la base de datos creado correctamente.")
+        return pool
+    except Exception as e:
+        flask_app.logger.error(f"Error al crear el pool de conexiones a la base de datos: {e}")
+        return None
+
+
+async def get_db_pool():
+    """
+    Devuelve el pool asyncpg, creándolo la primera vez. Si la base de datos no está disponible
+    devuelve None y se vuelve a intentar en la siguiente llamada.
+    """
+    global db_pool
+    if db_pool is None:
+        async with db_pool_lock:
+            if db_pool is None:
+                db_pool = await create_db_pool()
+    return db_pool
+
+
+def start_db_pool_warmup():
+    """Crea el pool en segundo plano si aún no existe ni se está creando."""
+    global db_pool_task
+    if db_pool is None and (db_pool_task is None or db_pool_task.done()):
+        db_pool_task = asyncio.create_task(get_db_pool())
+
+
+def get_groq_client():
+    """Devuelve el cliente Groq asíncrono, creándolo la primera vez. Devuelve None si no está configurado."""
+    global groq_client
+    if groq_client is None and flask_app.config['GROQ_API_KEY']:
+        try:
+            groq_client = AsyncGroq(api_key=flask_app.config['GROQ_API_KEY'])
+            flask_app.logger.info("Cliente Groq asíncrono inicializado correctamente.")
+        except Exception as e:
+            flask_app.logger.error(f"Error al inicializar el cliente Groq asíncrono: {e}")
+    return groq_client
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_app):
+    """
+    Precalienta en segundo plano el cliente Groq asíncrono, el pool de la base de datos y los
+    recursos de la aplicación Flask (ver /readyz), y cierra los recursos asíncronos al terminar.
+    """
+    global groq_client, db_pool, db_pool_lock, db_pool_task
+    # El lock y el pool pertenecen al bucle de eventos en el que se ejecuta la aplicación
+    db_pool_lock = asyncio.Lock()
+    get_resources(flask_app).start_warmup()
+    if flask_app.config['GROQ_API_KEY']:
+        get_groq_client()
+    else:
+        flask_app.logger.warning("GROQ_API_KEY no está configurada. La integración con Groq no funcionará.")
+    start_db_pool_warmup()
+    try:
+        yield
+    finally:
+        if db_pool_task is not None and not db_pool_task.done():
+            db_pool_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await db_pool_task
+        if groq_client is not None:
+            await groq_client.close()
+        if db_pool is not None:
+            await db_pool.close()
+        groq_client = db_pool = db_pool_task = None
+
+
+async def log_llm_interaction(prompt, response, model, ip_address):
+    """
+    Registra la interacción del LLM en la base de datos sin bloquear el bucle de eventos.
+    """
+    pool = await get_db_pool()
+    if pool is None:
+        flask_app.logger.error("No se pudo obtener conexión a la base de datos para registrar la interacción LLM.")
+        return
+    try:
+        await pool.execute(
+            """
+            INSERT INTO llm_interactions_log (user_prompt, llm_response, model_used, ip_address)
+            VALUES ($1, $2, $3, $4);
+            """,
+            prompt, response, model, ip_address
+        )
+        flask_app.logger.info(f"Interacción LLM registrada: Prompt '{prompt[:50]}...'")
+    except asyncpg.exceptions.UndefinedTableError:
+        flask_app.logger.error("ERROR: La tabla 'llm_interactions_log' no existe. No se pudo registrar la interacción LLM.")
+    except Exception as e:
+        flask_app.logger.error(f"ERROR: No se pudo registrar la interacción LLM en la base de datos: {e}")
+
+
+async def generate_text_with_llm(request):
+    """
+    Versión asíncrona de /generate_text: misma entrada, mismas respuestas y mismo registro en la base de datos.
+    """
+    client = get_groq_client()
+    if client is None:
+        flask_app.logger.error("La integración con Groq no está configurada. Falta GROQ_API_KEY o hubo un error de inicialización.")
+        return FlaskJSONResponse({"error": "La integración con Groq no está configurada. Falta GROQ_API_KEY o hubo un error de inicialización."}, status_code=503)
+
+    try:
+        data = await request.json()
+        prompt = data.get('prompt')
+
+        if not prompt:
+            return FlaskJSONResponse({"error": "Parámetro 'prompt' requerido en el cuerpo de la solicitud."}, status_code=400)
+
+        # Obtener la IP del cliente (para el registro)
+        ip_address = (request.client.host if request.client else None) or request.headers.get('X-Forwarded-For', 'N/A')
+
+        chat_completion = await client.chat.completions.create(
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt,
+                }
+            ],
+            model=GROQ_MODEL,
+        )
+
+        llm_response = chat_completion.choices[0].message.content
+
+        await log_llm_interaction(prompt, llm_response, GROQ_MODEL, ip_address)
+
+        return FlaskJSONResponse({"generated_text": llm_response})
+
+    except Exception as e:
+        flask_app.logger.error(f"Error al generar texto con Groq: {e}")
+        return FlaskJSONResponse({"error": "No se pudo generar texto con el LLM", "details": str(e)}, status_code=500)
+
+
+async def get_llm_logs(request):
+    """
+    Versión asíncrona de /logs. Admite paginación opcional con los parámetros 'limit' y 'offset'.
+    """
+    limit, offset, error = get_pagination_params(request.query_params)
+    if error:
+        return FlaskJSONResponse({"error": error}, status_code=400)
+
+    pool = await get_db_pool()
+    if pool is None:
+        return FlaskJSONResponse({"error": "No se pudo conectar a la base de datos"}, status_code=500)
+
+    try:
+        rows = await pool.fetch(
+            "SELECT id, user_prompt, llm_response, model_used, timestamp, ip_address FROM llm_interactions_log ORDER BY timestamp DESC, id DESC LIMIT $1 OFFSET $2;",
+            limit, offset
+        )
+        return FlaskJSONResponse([dict(row) for row in rows])
+    except asyncpg.exceptions.UndefinedTableError:
+        flask_app.logger.error("Error al obtener logs de interacciones LLM: La tabla 'llm_interactions_log' no existe.")
+        return FlaskJSONResponse({"error": "No se pudieron obtener los logs de interacciones LLM", "details": "La tabla 'llm_interactions_log' no existe"}, status_code=500)
+    except Exception as e:
+        flask_app.logger.error(f"Error al obtener logs de interacciones LLM: {e}")
+        return FlaskJSONResponse({"error": "No se pudieron obtener los logs de interacciones LLM", "details": str(e)}, status_code=500)
+
+
+async def readiness(request):
+    """
+    Readiness del modo asíncrono: además del precalentamiento de Flask exige el pool asyncpg y,
+    si hay GROQ_API_KEY, el cliente AsyncGroq. Nunca espera a una conexión: si falta algo lanza
+    su creación en segundo plano y devuelve 503.
+    """
+    resources = get_resources(flask_app)
+    groq_ready = get_groq_client() is not None or not flask_app.config['GROQ_API_KEY']
+    if resources.ready.is_set() and db_pool is not None and groq_ready:
+        return FlaskJSONResponse({"status": "ready"})
+    resources.start_warmup()
+    start_db_pool_warmup()
+    return FlaskJSONResponse({"status": "warming_up"}, status_code=503)
+
+
+app = Starlette(
+    routes=[
+        Route('/generate_text', generate_text_with_llm, methods=['POST']),
+        Route('/logs', get_llm_logs, methods=['GET']),
+        Route('/readyz', readiness, methods=['GET']),
+        # El resto de rutas las atiende la aplicación Flask en un pool de hilos
+        Mount('/', app=WSGIMiddleware(flask_app, workers=WSGI_THREADS)),
+    ],
+    lifespan=lifespan,
+)
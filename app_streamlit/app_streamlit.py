@@ -1,22 +1,26 @@
 import streamlit as st
 import requests
-import json # Importar para manejar JSON en las solicitudes POST
+
+# designers_client se instala con requirements.txt (-e .)
+from designers_client import DesignersClient
 
 # URL de tu API de Flask
 FLASK_API_URL = "https://repo-iagen-2.onrender.com"
 
 st.set_page_config(page_title="Catálogo de Diseñadores de Moda y Generador de Texto", layout="wide")
 
+@st.cache_resource
+def get_api_client():
+    """Crea un único cliente de la API (con su pool de conexiones) para toda la sesión de Streamlit."""
+    return DesignersClient(FLASK_API_URL)
+
 def fetch_designers(search_query=None):
     """Obtiene diseñadores de la API de Flask, opcionalmente con un término de búsqueda."""
+    client = get_api_client()
     try:
         if search_query:
-            response = requests.get(f"{FLASK_API_URL}/designers/search?query={search_query}")
-        else:
-            response = requests.get(f"{FLASK_API_URL}/designers")
-
-        response.raise_for_status()  # Lanza un error para códigos de estado HTTP 4xx/5xx
-        return response.json()
+            return client.search_designers(search_query)
+        return list(client.iter_designers())
     except requests.exceptions.ConnectionError:
         st.error(f"No se pudo conectar con la API de Flask en {FLASK_API_URL}. Asegúrate de que esté ejecutándose.")
         return None
@@ -28,20 +32,8 @@ def generate_text_with_llm_api(prompt, max_length):
     """
     Envía una solicitud POST a la API de Flask para generar texto con el LLM.
     """
-    endpoint = f"{FLASK_API_URL}/generate_text"
-    payload = {
-        "prompt": prompt,
-        "max_length": max_length
-    }
-    headers = {
-        "Content-Type": "application/json"
-    }
-
     try:
-        # Realiza la solicitud POST con el cuerpo JSON
-        response = requests.post(endpoint, data=json.dumps(payload), headers=headers)
-        response.raise_for_status() # Lanza un error para códigos de estado HTTP 4xx/5xx
-        return response.json()
+        return get_api_client().generate_text(prompt, max_length)
     except requests.exceptions.ConnectionError:
         st.error(f"No se pudo conectar con la API de Flask en {FLASK_API_URL}. Asegúrate de que esté ejecutándose.")
         return None
@@ -0,0 +1,71 @@
+"""
+Benchmark del arranque de la API.
+
+Mide, en procesos nuevos (como un arranque en frío), el tiempo de importar app.py, el de crear la
+aplicación con create_app() y, si la base de datos está configurada, el del precalentamiento.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_startup.py [--runs N] > bench_output.txt
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Código que se ejecuta en cada proceso nuevo; imprime los tiempos en JSON
+STARTUP_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+flask_app = app.create_app()
+created = time.perf_counter()
+warmup = None
+if "--warmup" in sys.argv:
+    try:
+        app.get_resources(flask_app).warmup()
+        warmup = time.perf_counter() - created
+    except Exception:
+        pass
+print(json.dumps({"import": imported - start, "create_app": created - imported, "warmup": warmup}))
+"""
+
+
+def run_once(with_warmup):
+    args = [sys.executable, "-c", STARTUP_SNIPPET]
+    if with_warmup:
+        args.append("--warmup")
+    output = subprocess.run(args, cwd=ROOT_DIR, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(name, values):
+    values_ms = [v * 1000 for v in values]
+    print(f"{name:<12} mediana {statistics.median(values_ms):8.1f} ms | "
+          f"mín {min(values_ms):8.1f} ms | máx {max(values_ms):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="número de arranques a medir (5 por defecto)")
+    parser.add_argument("--no-warmup", action="store_true", help="no medir el precalentamiento de recursos")
+    args = parser.parse_args()
+
+    results = [run_once(not args.no_warmup) for _ in range(args.runs)]
+
+    print(f"Arranque de la API ({args.runs} ejecuciones, Python {sys.version.split()[0]})")
+    summarize("import app", [r["import"] for r in results])
+    summarize("create_app", [r["create_app"] for r in results])
+    warmups = [r["warmup"] for r in results if r["warmup"] is not None]
+    if warmups:
+        summarize("warmup", warmups)
+    elif not args.no_warmup:
+        print("warmup       no medido (la base de datos no está disponible)")
+
+
+if __name__ == "__main__":
+    main()
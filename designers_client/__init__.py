@@ -0,0 +1,18 @@
+"""
+Cliente Python para la API del catálogo de diseñadores de moda.
+
+Ofrece una variante síncrona (basada en requests) y otra asíncrona (basada en httpx),
+ambas con conexiones keep-alive reutilizadas, timeouts, reintentos con backoff,
+iteradores de paginación y ayudantes para generar texto en lote.
+"""
+from designers_client._common import DEFAULT_BASE_URL, DEFAULT_TIMEOUT, RETRY_CONNECT
+from designers_client.async_client import AsyncDesignersClient
+from designers_client.client import DesignersClient
+
+__all__ = [
+    "DEFAULT_BASE_URL",
+    "DEFAULT_TIMEOUT",
+    "RETRY_CONNECT",
+    "AsyncDesignersClient",
+    "DesignersClient",
+]
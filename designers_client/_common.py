@@ -0,0 +1,38 @@
+"""Configuración y utilidades compartidas por los clientes síncrono y asíncrono."""
+import os
+
+# URL base por defecto; se puede sobrescribir con la variable de entorno DESIGNERS_API_URL
+DEFAULT_BASE_URL = os.getenv("DESIGNERS_API_URL", "http://127.0.0.1:5000")
+
+# Timeout por defecto en segundos (la generación con el LLM puede tardar varios segundos)
+DEFAULT_TIMEOUT = 30.0
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_PAGE_SIZE = 50
+
+# Códigos HTTP que indican un fallo transitorio y merecen un reintento
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# Valor de 'retry' para operaciones no idempotentes (generación con el LLM): solo se reintenta
+# si no se pudo establecer la conexión, es decir, si la petición no llegó a enviarse
+RETRY_CONNECT = "connect"
+
+
+def backoff_delay(attempt, backoff_factor):
+    """Devuelve la espera (en segundos) antes del reintento número 'attempt' (empezando en 0)."""
+    return backoff_factor * (2 ** attempt)
+
+
+def check_page_size(page_size):
+    """Valida el tamaño de página de los iteradores (con 0 pedirían páginas vacías sin fin)."""
+    if page_size < 1:
+        raise ValueError("page_size debe ser un entero mayor o igual que 1")
+
+
+def generation_payload(prompt, max_length=None):
+    """Construye el cuerpo JSON para /generate_text."""
+    payload = {"prompt": prompt}
+    if max_length is not None:
+        payload["max_length"] = max_length
+    return payload
@@ -0,0 +1,172 @@
+"""Cliente asíncrono (asyncio) para la API de diseñadores, basado en httpx.AsyncClient."""
+import asyncio
+
+import httpx
+
+from designers_client._common import (
+    DEFAULT_BASE_URL,
+    DEFAULT_TIMEOUT,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_PAGE_SIZE,
+    RETRY_STATUS_CODES,
+    RETRY_CONNECT,
+    backoff_delay,
+    check_page_size,
+    generation_payload,
+)
+
+
+class AsyncDesignersClient:
+    """
+    Cliente asíncrono de la API, equivalente a DesignersClient. Reutiliza las conexiones
+    a través de un único httpx.AsyncClient y reintenta con backoff exponencial los errores
+    de red y las respuestas 429/502/503/504.
+
+    Los errores HTTP se propagan como excepciones de httpx (HTTPStatusError, TransportError...).
+    Se usa con 'async with' para cerrar el pool de conexiones al terminar.
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, timeout=DEFAULT_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 max_connections=20):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Cierra las conexiones abiertas del pool."""
+        await self.client.aclose()
+
+    async def request(self, method, path, retry=True, **kwargs):
+        """
+        Realiza una petición HTTP y devuelve la respuesta sin comprobar el código de estado.
+        Si 'retry' es False no se reintenta (útil para operaciones no idempotentes); con
+        RETRY_CONNECT solo se reintenta si la petición no llegó a enviarse.
+        """
+        attempts = self.max_retries + 1 if retry else 1
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except httpx.TransportError as e:
+                connect_error = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if last_attempt or (retry == RETRY_CONNECT and not connect_error):
+                    raise
+            else:
+                if retry == RETRY_CONNECT or response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    return response
+            await asyncio.sleep(backoff_delay(attempt, self.backoff_factor))
+
+    async def _json(self, method, path, **kwargs):
+        response = await self.request(method, path, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def root(self):
+        """Devuelve el mensaje de bienvenida de la API."""
+        response = await self.request("GET", "/")
+        response.raise_for_status()
+        return response.text
+
+    # --- Diseñadores ---
+
+    async def list_designers(self, limit=None, offset=0):
+        """Obtiene diseñadores; sin 'limit' devuelve el catálogo completo."""
+        params = {"offset": offset}
+        if limit is not None:
+            params["limit"] = limit
+        return await self._json("GET", "/designers", params=params)
+
+    def iter_designers(self, page_size=DEFAULT_PAGE_SIZE):
+        """Itera (async for) por todos los diseñadores pidiéndolos página a página."""
+        check_page_size(page_size)
+        return self._paginate(self.list_designers, page_size)
+
+    async def get_designer(self, designer_id):
+        """Obtiene un diseñador por su ID."""
+        return await self._json("GET", f"/designers/{int(designer_id)}")
+
+    async def search_designers(self, query):
+        """Busca diseñadores por nombre, nacionalidad o estilo."""
+        return await self._json("GET", "/designers/search", params={"query": query})
+
+    async def add_designer(self, designer):
+        """Añade un diseñador. No se reintenta para no crear duplicados."""
+        return await self._json("POST", "/designers", json=designer, retry=False)
+
+    # --- LLM ---
+
+    async def generate_text(self, prompt, max_length=None):
+        """
+        Genera texto con el LLM y devuelve el JSON de respuesta ({"generated_text": ...}).
+        Cada llamada ejecuta el LLM y se registra, así que solo se reintenta si no se pudo conectar.
+        """
+        return await self._json("POST", "/generate_text", json=generation_payload(prompt, max_length), retry=RETRY_CONNECT)
+
+    async def generate_many(self, prompts, max_length=None, concurrency=8, return_exceptions=False):
+        """
+        Genera texto para varios prompts de forma concurrente, con un máximo de
+        'concurrency' peticiones en vuelo. Devuelve los resultados en el mismo orden
+        que 'prompts'; con return_exceptions=True los errores se devuelven en su posición.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(prompt):
+            async with semaphore:
+                return await self.generate_text(prompt, max_length)
+
+        return await asyncio.gather(*(generate(p) for p in prompts), return_exceptions=return_exceptions)
+
+    # --- Sesiones de conversación ---
+
+    async def create_session(self):
+        """Crea una sesión de conversación y devuelve su ID."""
+        return (await self._json("POST", "/sessions", retry=False))["session_id"]
+
+    async def get_session(self, session_id):
+        """Obtiene una sesión con su resumen y el historial completo de turnos."""
+        return await self._json("GET", f"/sessions/{int(session_id)}")
+
+    async def send_message(self, session_id, prompt):
+        """
+        Envía un mensaje dentro de una sesión; el servidor aporta el contexto de los turnos previos.
+        No se reintenta para no duplicar turnos. Si otro mensaje de la misma sesión se guardó antes,
+        el servidor responde 409 y se lanza el error HTTP correspondiente.
+        """
+        return await self._json("POST", f"/sessions/{int(session_id)}/messages", json={"prompt": prompt}, retry=False)
+
+    async def list_logs(self, limit=None, offset=0):
+        """Obtiene el historial de interacciones con el LLM (más recientes primero)."""
+        params = {"offset": offset}
+        if limit is not None:
+            params["limit"] = limit
+        return await self._json("GET", "/logs", params=params)
+
+    def iter_logs(self, page_size=DEFAULT_PAGE_SIZE):
+        """Itera (async for) por todo el historial de interacciones pidiéndolo página a página."""
+        check_page_size(page_size)
+        return self._paginate(self.list_logs, page_size)
+
+    @staticmethod
+    async def _paginate(fetch_page, page_size):
+        offset = 0
+        while True:
+            page = await fetch_page(limit=page_size, offset=offset)
+            for item in page:
+                yield item
+            # Una página incompleta es la última. Si el servidor ignora 'limit' y devuelve más
+            # elementos de los pedidos, pedir el siguiente desplazamiento no terminaría nunca
+            if len(page) != page_size:
+                return
+            offset += page_size
@@ -0,0 +1,191 @@
+"""Cliente síncrono para la API de diseñadores, basado en requests.Session."""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from designers_client._common import (
+    DEFAULT_BASE_URL,
+    DEFAULT_TIMEOUT,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_PAGE_SIZE,
+    RETRY_STATUS_CODES,
+    RETRY_CONNECT,
+    backoff_delay,
+    check_page_size,
+    generation_payload,
+)
+
+
+def _is_connect_error(error):
+    """Indica si el error se produjo al establecer la conexión, antes de enviar la petición."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    # requests envuelve los errores de urllib3 en un ConnectionError genérico; el error original es el
+    # 'reason' del MaxRetryError. NewConnectionError cubre la conexión rechazada y los fallos de DNS
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+class DesignersClient:
+    """
+    Cliente síncrono de la API. Reutiliza las conexiones HTTP (keep-alive) a través de
+    una única requests.Session y reintenta con backoff exponencial los errores de conexión,
+    timeouts y respuestas 429/502/503/504.
+
+    Los errores HTTP se propagan como excepciones de requests (HTTPError, ConnectionError...).
+    Se puede usar como gestor de contexto para cerrar el pool de conexiones al terminar.
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, timeout=DEFAULT_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 pool_maxsize=10):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.session = requests.Session()
+        # Los reintentos se gestionan en request(); el adaptador solo dimensiona el pool
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Cierra las conexiones abiertas del pool."""
+        self.session.close()
+
+    def request(self, method, path, retry=True, **kwargs):
+        """
+        Realiza una petición HTTP y devuelve la respuesta sin comprobar el código de estado.
+        Si 'retry' es False no se reintenta (útil para operaciones no idempotentes); con
+        RETRY_CONNECT solo se reintenta si la petición no llegó a enviarse.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        url = f"{self.base_url}{path}"
+        attempts = self.max_retries + 1 if retry else 1
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if last_attempt or (retry == RETRY_CONNECT and not _is_connect_error(e)):
+                    raise
+            else:
+                if retry == RETRY_CONNECT or response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    return response
+                response.close()
+            time.sleep(backoff_delay(attempt, self.backoff_factor))
+
+    def _json(self, method, path, **kwargs):
+        response = self.request(method, path, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def root(self):
+        """Devuelve el mensaje de bienvenida de la API."""
+        response = self.request("GET", "/")
+        response.raise_for_status()
+        return response.text
+
+    # --- Diseñadores ---
+
+    def list_designers(self, limit=None, offset=0):
+        """Obtiene diseñadores; sin 'limit' devuelve el catálogo completo."""
+        params = {"offset": offset}
+        if limit is not None:
+            params["limit"] = limit
+        return self._json("GET", "/designers", params=params)
+
+    def iter_designers(self, page_size=DEFAULT_PAGE_SIZE):
+        """Itera por todos los diseñadores pidiéndolos página a página."""
+        check_page_size(page_size)
+        return self._paginate(self.list_designers, page_size)
+
+    def get_designer(self, designer_id):
+        """Obtiene un diseñador por su ID."""
+        return self._json("GET", f"/designers/{int(designer_id)}")
+
+    def search_designers(self, query):
+        """Busca diseñadores por nombre, nacionalidad o estilo."""
+        return self._json("GET", "/designers/search", params={"query": query})
+
+    def add_designer(self, designer):
+        """Añade un diseñador. No se reintenta para no crear duplicados."""
+        return self._json("POST", "/designers", json=designer, retry=False)
+
+    # --- LLM ---
+
+    def generate_text(self, prompt, max_length=None):
+        """
+        Genera texto con el LLM y devuelve el JSON de respuesta ({"generated_text": ...}).
+        Cada llamada ejecuta el LLM y se registra, así que solo se reintenta si no se pudo conectar.
+        """
+        return self._json("POST", "/generate_text", json=generation_payload(prompt, max_length), retry=RETRY_CONNECT)
+
+    def generate_many(self, prompts, max_length=None, max_workers=4, return_exceptions=False):
+        """
+        Genera texto para varios prompts en paralelo, compartiendo el pool de conexiones.
+        Devuelve los resultados en el mismo orden que 'prompts'. Con return_exceptions=True
+        los errores se devuelven en la posición correspondiente en lugar de lanzarse.
+        """
+        def generate(prompt):
+            try:
+                return self.generate_text(prompt, max_length)
+            except Exception as e:
+                if return_exceptions:
+                    return e
+                raise
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(generate, prompts))
+
+    # --- Sesiones de conversación ---
+
+    def create_session(self):
+        """Crea una sesión de conversación y devuelve su ID."""
+        return self._json("POST", "/sessions", retry=False)["session_id"]
+
+    def get_session(self, session_id):
+        """Obtiene una sesión con su resumen y el historial completo de turnos."""
+        return self._json("GET", f"/sessions/{int(session_id)}")
+
+    def send_message(self, session_id, prompt):
+        """
+        Envía un mensaje dentro de una sesión; el servidor aporta el contexto de los turnos previos.
+        No se reintenta para no duplicar turnos. Si otro mensaje de la misma sesión se guardó antes,
+        el servidor responde 409 y se lanza el error HTTP correspondiente.
+        """
+        return self._json("POST", f"/sessions/{int(session_id)}/messages", json={"prompt": prompt}, retry=False)
+
+    def list_logs(self, limit=None, offset=0):
+        """Obtiene el historial de interacciones con el LLM (más recientes primero)."""
+        params = {"offset": offset}
+        if limit is not None:
+            params["limit"] = limit
+        return self._json("GET", "/logs", params=params)
+
+    def iter_logs(self, page_size=DEFAULT_PAGE_SIZE):
+        """Itera por todo el historial de interacciones pidiéndolo página a página."""
+        check_page_size(page_size)
+        return self._paginate(self.list_logs, page_size)
+
+    @staticmethod
+    def _paginate(fetch_page, page_size):
+        offset = 0
+        while True:
+            page = fetch_page(limit=page_size, offset=offset)
+            yield from page
+            # Una página incompleta es la última. Si el servidor ignora 'limit' y devuelve más
+            # elementos de los pedidos, pedir el siguiente desplazamiento no terminaría nunca
+            if len(page) != page_size:
+                return
+            offset += page_size
@@ -0,0 +1,36 @@
+# Configuración de gunicorn (servidor de producción). Se carga automáticamente al ejecutar
+# 'gunicorn' desde la raíz del proyecto. Todos los valores se pueden ajustar con variables de entorno.
+import os
+
+# Aplicación a servir. Por defecto la fábrica de Flask; para el modo asíncrono usar
+# GUNICORN_APP=app_async:app y GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker
+wsgi_app = os.getenv("GUNICORN_APP", "app:create_app()")
+
+# Puerto asignado por Render (PORT) o 5000 en local/Docker
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+
+# Workers preforkeados: WEB_CONCURRENCY es la variable estándar en Render. El valor por defecto es
+# fijo y pequeño porque cada worker abre su propio pool de conexiones a PostgreSQL (hasta
+# DB_POOL_MAX_SIZE, el doble en el modo asíncrono), y con 2 × CPUs + 1 workers una máquina grande
+# agota enseguida el max_connections de la base de datos.
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+threads = int(os.getenv("GUNICORN_THREADS", 1))
+
+# Las generaciones con el LLM pueden tardar varios segundos
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+
+# Cargar la aplicación en el proceso maestro antes del fork reduce la memoria y el arranque de
+# cada worker. Es seguro porque los recursos (Groq, pool de la base de datos) se crean después.
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_worker_init(worker):
+    """Precalienta los recursos de la aplicación en cada worker, después del fork."""
+    resources = getattr(worker.wsgi, "extensions", {}).get("resources")
+    if resources is not None:
+        resources.start_warmup()
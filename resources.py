@@ -0,0 +1,179 @@
+"""
+Recursos costosos de la aplicación (cliente Groq, pool de conexiones a PostgreSQL y caché de sesiones).
+
+Nada se crea al importar el módulo ni al construir la aplicación: cada recurso se inicializa
+la primera vez que se usa o durante el precalentamiento (warmup), que se lanza en segundo plano
+en cada worker después del fork. Así el arranque es rápido y las conexiones no se comparten
+entre procesos.
+"""
+import threading
+import time
+
+import psycopg2
+import psycopg2.pool
+
+import sessions
+
+
+class AppResources:
+    """Contenedor de los recursos de una instancia de la aplicación, con inicialización diferida."""
+
+    def __init__(self, config, logger):
+        self.config = config
+        self.logger = logger
+        self.session_cache = sessions.SessionCache(config['SESSION_CACHE_SIZE'])
+        # Se activa cuando el precalentamiento ha terminado correctamente (readiness)
+        self.ready = threading.Event()
+        # Un lock por recurso: la creación lenta de uno no bloquea a los demás ni a /readyz
+        self._groq_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        # Solo protege el arranque del hilo de precalentamiento; nunca se mantiene durante E/S
+        self._warmup_lock = threading.Lock()
+        self._groq_client = None
+        self._groq_initialized = False
+        self._db_pool = None
+        # getconn() del pool falla en cuanto se agotan las conexiones en lugar de esperar;
+        # el semáforo hace que los hilos esperen a que quede una libre
+        self._db_slots = threading.BoundedSemaphore(config['DB_POOL_MAX_SIZE'])
+        self._warmup_thread = None
+
+    # --- Cliente Groq ---
+
+    def groq_client(self):
+        """Devuelve el cliente Groq, creándolo la primera vez. Devuelve None si no está configurado."""
+        if not self._groq_initialized:
+            with self._groq_lock:
+                if not self._groq_initialized:
+                    self._groq_client = self._create_groq_client()
+                    self._groq_initialized = True
+        return self._groq_client
+
+    def _create_groq_client(self):
+        api_key = self.config['GROQ_API_KEY']
+        if not api_key:
+            self.logger.warning("GROQ_API_KEY no está configurada. La integración con Groq no funcionará.")
+            return None
+        try:
+            # Importación diferida: el SDK de Groq es lo que más tarda en cargarse
+            from groq import Groq
+            client = Groq(api_key=api_key)
+            self.logger.info("Cliente Groq inicializado correctamente.")
+            return client
+        except Exception as e:
+            self.logger.error(f"Error al inicializar el cliente Groq: {e}")
+            return None
+
+    # --- Base de datos ---
+
+    def db_pool(self):
+        """Devuelve el pool de conexiones, creándolo la primera vez. Devuelve None si no se puede conectar."""
+        if self._db_pool is None:
+            with self._db_lock:
+                if self._db_pool is None:
+                    self._db_pool = self._create_db_pool()
+        return self._db_pool
+
+    def _create_db_pool(self):
+        config = self.config
+        try:
+            if config['DB_URL']:
+                pool = psycopg2.pool.ThreadedConnectionPool(
+                    config['DB_POOL_MIN_SIZE'], config['DB_POOL_MAX_SIZE'], config['DB_URL'],
+                    connect_timeout=config['DB_CONNECT_TIMEOUT']
+                )
+                self.logger.info("Pool de conexiones a la base de datos creado usando DATABASE_URL!")
+            else:
+                pool = psycopg2.pool.ThreadedConnectionPool(
+                    config['DB_POOL_MIN_SIZE'], config['DB_POOL_MAX_SIZE'],
+                    dbname=config['DB_NAME'],
+                    user=config['DB_USER'],
+                    password=config['DB_PASSWORD'],
+                    host=config['DB_HOST'],
+                    port=config['DB_PORT'],
+                    connect_timeout=config['DB_CONNECT_TIMEOUT']
+                )
+                self.logger.info("Pool de conexiones a la base de datos creado usando variables individuales!")
+            return pool
+        except Exception as e:
+            self.logger.error(f"Error al conectar a la base de datos: {e}")
+            return None
+
+    def get_connection(self):
+        """
+        Obtiene una conexión del pool, esperando hasta DB_POOL_TIMEOUT segundos si están todas en uso.
+        Devuelve None si no hay base de datos disponible o si se agota la espera.
+        """
+        pool = self.db_pool()
+        if pool is None:
+            return None
+        if not self._db_slots.acquire(timeout=self.config['DB_POOL_TIMEOUT']):
+            self.logger.error("Tiempo de espera agotado para obtener una conexión del pool.")
+            return None
+        try:
+            conn = pool.getconn()
+            if not self._is_alive(conn):
+                # El servidor cortó la conexión (p. ej. reinicio de la base de datos): se descarta y se abre otra
+                pool.putconn(conn, close=True)
+                conn = pool.getconn()
+            return conn
+        except Exception as e:
+            self._db_slots.release()
+            self.logger.error(f"Error al obtener una conexión del pool: {e}")
+            return None
+
+    @staticmethod
+    def _is_alive(conn):
+        """
+        Comprueba la conexión con una consulta mínima. conn.closed solo detecta las conexiones
+        cerradas por el cliente, no las que el servidor ha cortado.
+        """
+        if conn.closed:
+            return False
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1;")
+            cur.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def release_connection(self, conn):
+        """Devuelve una conexión al pool (las transacciones abiertas se deshacen)."""
+        try:
+            self._db_pool.putconn(conn)
+        except Exception as e:
+            self.logger.error(f"Error al devolver la conexión al pool: {e}")
+        finally:
+            self._db_slots.release()
+
+    # --- Precalentamiento ---
+
+    def warmup(self):
+        """Inicializa todos los recursos y comprueba la base de datos. Lanza una excepción si falla."""
+        start = time.perf_counter()
+        self.groq_client()
+        # get_connection() ya comprueba la conexión con SELECT 1
+        conn = self.get_connection()
+        if conn is None:
+            raise RuntimeError("No se pudo conectar a la base de datos")
+        self.release_connection(conn)
+        self.ready.set()
+        self.logger.info(f"Recursos precalentados en {time.perf_counter() - start:.2f} s.")
+
+    def start_warmup(self):
+        """
+        Lanza el precalentamiento en un hilo en segundo plano, si no está listo ni en curso.
+        No espera a ninguna conexión, así que se puede llamar desde /readyz.
+        """
+        with self._warmup_lock:
+            if self.ready.is_set() or (self._warmup_thread is not None and self._warmup_thread.is_alive()):
+                return
+            self._warmup_thread = threading.Thread(target=self._run_warmup, name="warmup", daemon=True)
+            self._warmup_thread.start()
+
+    def _run_warmup(self):
+        try:
+            self.warmup()
+        except Exception as e:
+            self.logger.error(f"Error durante el precalentamiento de recursos: {e}")
@@ -0,0 +1,130 @@
+"""
+Lógica de las sesiones de conversación (multi-turno) con el LLM.
+
+Cada conversación se guarda en las tablas 'conversations' y 'conversation_turns'. Para no
+reenviar todo el historial en cada llamada, solo se envía al LLM una ventana de los turnos
+más recientes que cabe en un presupuesto de tokens; los turnos más antiguos se condensan una
+única vez en un resumen que se guarda en la conversación y se reutiliza en las siguientes llamadas.
+
+Las conversaciones activas se mantienen en una caché LRU en memoria para no tener que leer
+su historial de la base de datos en cada turno.
+"""
+import threading
+from collections import OrderedDict
+
+
+class ConversationState:
+    """
+    Estado de una conversación necesario para construir el contexto del LLM.
+    'turns' contiene solo los turnos que aún no están incluidos en el resumen,
+    como tuplas (mensaje del usuario, respuesta del asistente).
+    """
+
+    def __init__(self, session_id, summary=None, summarized_turns=0, turns=None):
+        self.session_id = session_id
+        self.summary = summary
+        self.summarized_turns = summarized_turns
+        self.turns = list(turns or [])
+
+    @property
+    def turn_count(self):
+        """Número total de turnos de la conversación (resumidos y sin resumir)."""
+        return self.summarized_turns + len(self.turns)
+
+    def copy(self):
+        """Copia independiente, para modificarla sin afectar al estado compartido en la caché."""
+        return ConversationState(self.session_id, self.summary, self.summarized_turns, self.turns)
+
+
+class SessionCache:
+    """Caché LRU, segura entre hilos, de las conversaciones más usadas."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        with self._lock:
+            state = self._states.get(session_id)
+            if state is not None:
+                self._states.move_to_end(session_id)
+            return state
+
+    def put(self, state):
+        with self._lock:
+            self._states[state.session_id] = state
+            self._states.move_to_end(state.session_id)
+            while len(self._states) > self.max_size:
+                self._states.popitem(last=False)
+
+    def discard(self, session_id):
+        with self._lock:
+            self._states.pop(session_id, None)
+
+
+def estimate_tokens(text):
+    """Estimación aproximada del número de tokens de un texto (unos 4 caracteres por token)."""
+    return len(text or "") // 4 + 1
+
+
+def _window_start(turns, budget):
+    """Devuelve el índice del turno más antiguo que cabe en 'budget' recorriendo desde el más reciente."""
+    used = 0
+    start = len(turns)
+    for i in range(len(turns) - 1, -1, -1):
+        used += estimate_tokens(turns[i][0]) + estimate_tokens(turns[i][1])
+        if used > budget:
+            break
+        start = i
+    return start
+
+
+def turns_to_summarize(state, prompt, token_budget):
+    """
+    Devuelve cuántos de los turnos sin resumir deben pasar al resumen para que el contexto
+    (resumen + ventana de turnos + prompt) quepa en 'token_budget'. Devuelve 0 si ya cabe.
+
+    Cuando hay que resumir se deja la ventana a la mitad del presupuesto disponible, de modo
+    que los siguientes turnos caben sin volver a resumir en cada llamada.
+    """
+    available = token_budget - estimate_tokens(state.summary) - estimate_tokens(prompt)
+    if _window_start(state.turns, available) == 0:
+        return 0
+    return max(_window_start(state.turns, available // 2), 1)
+
+
+def build_messages(state, prompt):
+    """Construye la lista de mensajes para el LLM: resumen previo, turnos recientes y nuevo prompt."""
+    messages = []
+    if state.summary:
+        messages.append({
+            "role": "system",
+            "content": f"Resumen de la conversación anterior con el usuario:\n{state.summary}",
+        })
+    for user_message, assistant_message in state.turns:
+        messages.append({"role": "user", "content": user_message})
+        messages.append({"role": "assistant", "content": assistant_message})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+def build_summary_messages(previous_summary, turns):
+    """Construye los mensajes que piden al LLM condensar el resumen previo y los turnos indicados."""
+    transcript = "\n".join(
+        f"Usuario: {user_message}\nAsistente: {assistant_message}"
+        for user_message, assistant_message in turns
+    )
+    if previous_summary:
+        transcript = f"Resumen previo:\n{previous_summary}\n\nNuevos turnos:\n{transcript}"
+    return [
+        {
+            "role": "system",
+            "content": (
+                "Resume de forma concisa la siguiente conversación entre un usuario y un asistente "
+                "de moda. Conserva los datos, preferencias y decisiones que puedan ser necesarios "
+                "para continuarla. Responde solo con el resumen."
+            ),
+        },
+        {"role": "user", "content": transcript},
+    ]
@@ -1,21 +1,30 @@
+import asyncio
 import requests
 import pytest
 import time # Para pausas cortas si es necesario
 
+from designers_client import AsyncDesignersClient, DesignersClient
+
 # URL base de tu API de Flask
 
 # FLASK_API_URL = "https://repo-iagen-2.onrender.com"
 FLASK_API_URL = "http://127.0.0.1:5000"
 
+# Cliente compartido por todos los tests (reutiliza las conexiones HTTP)
+@pytest.fixture(scope="module")
+def client():
+    with DesignersClient(FLASK_API_URL) as api_client:
+        yield api_client
+
 # --- Tests para la API de Diseñadores ---
 
 # Test para la ruta raíz (inicio)
-def test_root_endpoint():
+def test_root_endpoint(client):
     """
     Verifica que la ruta raíz de la API devuelve el mensaje esperado.
     """
     try:
-        response = requests.get(f"{FLASK_API_URL}/")
+        response = client.request("GET", "/")
         response.raise_for_status() # Lanza una excepción para códigos de estado HTTP 4xx/5xx
         assert response.status_code == 200
         assert "Inicio de la API de designers" in response.text
@@ -25,17 +34,39 @@ def test_root_endpoint():
     except Exception as e:
         pytest.fail(f"Test 'test_root_endpoint' FAILED: {e}")
 
+# Test para las sondas de liveness y readiness
+def test_health_endpoints(client):
+    """
+    Verifica que /healthz responde siempre y que /readyz pasa a 'ready' tras el precalentamiento.
+    """
+    try:
+        response = client.request("GET", "/healthz")
+        assert response.status_code == 200
+        assert response.json().get("status") == "ok"
+
+        # El precalentamiento se ejecuta en segundo plano; se espera unos segundos como máximo
+        for _ in range(20):
+            response = client.request("GET", "/readyz", retry=False)
+            if response.status_code == 200:
+                break
+            assert response.json().get("status") == "warming_up"
+            time.sleep(0.5)
+        assert response.status_code == 200
+        assert response.json().get("status") == "ready"
+        print(f"\nTest 'test_health_endpoints' PASSED.")
+    except requests.exceptions.ConnectionError:
+        pytest.fail(f"No se pudo conectar con la API de Flask en {FLASK_API_URL}. Asegúrate de que esté ejecutándose.")
+    except Exception as e:
+        pytest.fail(f"Test 'test_health_endpoints' FAILED: {e}")
+
 # Test para obtener todos los diseñadores
-def test_get_all_designers():
+def test_get_all_designers(client):
     """
     Verifica que la ruta /designers (GET) devuelve una lista de diseñadores.
     Asume que hay al menos un diseñador en la base de datos.
     """
     try:
-        response = requests.get(f"{FLASK_API_URL}/designers")
-        response.raise_for_status()
-        assert response.status_code == 200
-        designers = response.json()
+        designers = client.list_designers()
         assert isinstance(designers, list)
         # Opcional: Si esperas que haya al menos 3 diseñadores (los de ejemplo)
         assert len(designers) >= 3
@@ -46,7 +77,7 @@ def test_get_all_designers():
         pytest.fail(f"Test 'test_get_all_designers' FAILED: {e}")
 
 # Test para añadir un nuevo diseñador y luego verificar su existencia
-def test_add_and_get_new_designer():
+def test_add_and_get_new_designer(client):
     """
     Verifica la ruta /designers (POST) añadiendo un nuevo diseñador
     y luego verifica que se puede recuperar por su ID.
@@ -61,7 +92,7 @@ def test_add_and_get_new_designer():
     designer_id = None
     try:
         # Añadir el diseñador (POST)
-        post_response = requests.post(f"{FLASK_API_URL}/designers", json=new_designer_data)
+        post_response = client.request("POST", "/designers", retry=False, json=new_designer_data)
         post_response.raise_for_status()
         assert post_response.status_code == 201 # 201 Created
         response_json = post_response.json()
@@ -72,7 +103,7 @@ def test_add_and_get_new_designer():
         print(f"\nTest 'test_add_and_get_new_designer' (POST) PASSED. ID: {designer_id}")
 
         # Verifica que el diseñador se puede obtener por ID (GET)
-        get_response = requests.get(f"{FLASK_API_URL}/designers/{designer_id}")
+        get_response = client.request("GET", f"/designers/{designer_id}")
         get_response.raise_for_status()
         assert get_response.status_code == 200
         retrieved_designer = get_response.json()
@@ -95,14 +126,14 @@ def test_add_and_get_new_designer():
 
 
 # Test para obtener un diseñador por ID existente
-def test_get_designer_by_existing_id():
+def test_get_designer_by_existing_id(client):
     """
     Verifica que la ruta /designers/<id> (GET) devuelve un diseñador existente.
     Asume que el ID 1 existe en la base de datos.
     """
     designer_id = 1 # Asume que el ID 1 (Coco Chanel) existe
     try:
-        response = requests.get(f"{FLASK_API_URL}/designers/{designer_id}")
+        response = client.request("GET", f"/designers/{designer_id}")
         response.raise_for_status()
         assert response.status_code == 200
         designer = response.json()
@@ -115,13 +146,13 @@ def test_get_designer_by_existing_id():
         pytest.fail(f"Test 'test_get_designer_by_existing_id' FAILED: {e}")
 
 # Test para obtener un diseñador por ID inexistente
-def test_get_designer_by_non_existing_id():
+def test_get_designer_by_non_existing_id(client):
     """
     Verifica que la ruta /designers/<id> (GET) devuelve 404 para un ID inexistente.
     """
     non_existing_id = 999999 # Un ID que es muy poco probable que exista
     try:
-        response = requests.get(f"{FLASK_API_URL}/designers/{non_existing_id}")
+        response = client.request("GET", f"/designers/{non_existing_id}")
         assert response.status_code == 404
         assert "Diseñador no encontrado" in response.json().get("message", "")
         print(f"\nTest 'test_get_designer_by_non_existing_id' PASSED. Mensaje: {response.json().get('message')}")
@@ -131,16 +162,13 @@ def test_get_designer_by_non_existing_id():
         pytest.fail(f"Test 'test_get_designer_by_non_existing_id' FAILED: {e}")
 
 # Test para buscar diseñadores con un término de búsqueda válido
-def test_search_designers_valid_query():
+def test_search_designers_valid_query(client):
     """
     Verifica que la ruta /designers/search (GET) devuelve resultados para una búsqueda válida.
     """
     search_term = "chanel" # O cualquier término que sepas que está en tus datos
     try:
-        response = requests.get(f"{FLASK_API_URL}/designers/search?query={search_term}")
-        response.raise_for_status()
-        assert response.status_code == 200
-        designers = response.json()
+        designers = client.search_designers(search_term)
         assert isinstance(designers, list)
         assert len(designers) > 0 # Esperamos al menos un resultado
         assert any(search_term.lower() in d.get('name', '').lower() for d in designers)
@@ -151,12 +179,12 @@ def test_search_designers_valid_query():
         pytest.fail(f"Test 'test_search_designers_valid_query' FAILED: {e}")
 
 # Test para buscar diseñadores sin término de búsqueda (debe devolver 400)
-def test_search_designers_no_query_param():
+def test_search_designers_no_query_param(client):
     """
     Verifica que la ruta /designers/search (GET) devuelve 400 si no hay parámetro 'query'.
     """
     try:
-        response = requests.get(f"{FLASK_API_URL}/designers/search")
+        response = client.request("GET", "/designers/search")
         assert response.status_code == 400
         assert "Parámetro 'query' requerido" in response.json().get("message", "")
         print(f"\nTest 'test_search_designers_no_query_param' PASSED. Mensaje: {response.json().get('message')}")
@@ -166,16 +194,13 @@ def test_search_designers_no_query_param():
         pytest.fail(f"Test 'test_search_designers_no_query_param' FAILED: {e}")
 
 # Test para buscar diseñadores con un término de búsqueda que no existe
-def test_search_designers_no_results():
+def test_search_designers_no_results(client):
     """
     Verifica que la ruta /designers/search (GET) devuelve una lista vacía para una búsqueda sin resultados.
     """
     search_term = "xyz_nonexistent_designer_123" # Un término que no debería existir
     try:
-        response = requests.get(f"{FLASK_API_URL}/designers/search?query={search_term}")
-        response.raise_for_status()
-        assert response.status_code == 200
-        designers = response.json()
+        designers = client.search_designers(search_term)
         assert isinstance(designers, list)
         assert len(designers) == 0 # Esperamos 0 resultados
         print(f"\nTest 'test_search_designers_no_results' PASSED. Resultados: {len(designers)}")
@@ -185,7 +210,7 @@ def test_search_designers_no_results():
         pytest.fail(f"Test 'test_search_designers_no_results' FAILED: {e}")
 
 # Test para añadir un diseñador con datos incompletos (POST)
-def test_add_designer_incomplete_data():
+def test_add_designer_incomplete_data(client):
     """
     Verifica que la ruta /designers (POST) devuelve 400 para datos incompletos.
     """
@@ -195,7 +220,7 @@ def test_add_designer_incomplete_data():
         # Faltan style, famous_works, website
     }
     try:
-        response = requests.post(f"{FLASK_API_URL}/designers", json=incomplete_data)
+        response = client.request("POST", "/designers", retry=False, json=incomplete_data)
         assert response.status_code == 400
         assert "Falta el campo" in response.json().get("error", "")
         print(f"\nTest 'test_add_designer_incomplete_data' PASSED. Mensaje: {response.json().get('error')}")
@@ -204,8 +229,54 @@ def test_add_designer_incomplete_data():
     except Exception as e:
         pytest.fail(f"Test 'test_add_designer_incomplete_data' FAILED: {e}")
 
+# Test para la paginación de /designers mediante el iterador del cliente
+def test_iter_designers_paginates(client):
+    """
+    Verifica que iter_designers recorre todas las páginas y devuelve los mismos
+    diseñadores que una única petición sin paginar.
+    """
+    try:
+        all_designers = client.list_designers()
+        paged_designers = list(client.iter_designers(page_size=2))
+        assert [d["id"] for d in paged_designers] == [d["id"] for d in all_designers]
+        print(f"\nTest 'test_iter_designers_paginates' PASSED. Total diseñadores: {len(paged_designers)}")
+    except requests.exceptions.ConnectionError:
+        pytest.fail(f"No se pudo conectar con la API de Flask en {FLASK_API_URL}. Asegúrate de que esté ejecutándose.")
+    except Exception as e:
+        pytest.fail(f"Test 'test_iter_designers_paginates' FAILED: {e}")
+
+# Test para parámetros de paginación inválidos
+def test_designers_invalid_pagination(client):
+    """
+    Verifica que /designers devuelve 400 si 'limit' no es un entero válido.
+    """
+    try:
+        response = client.request("GET", "/designers", params={"limit": "abc"})
+        assert response.status_code == 400
+        assert "limit" in response.json().get("error", "")
+        print(f"\nTest 'test_designers_invalid_pagination' PASSED. Mensaje: {response.json().get('error')}")
+    except requests.exceptions.ConnectionError:
+        pytest.fail(f"No se pudo conectar con la API de Flask en {FLASK_API_URL}. Asegúrate de que esté ejecutándose.")
+    except Exception as e:
+        pytest.fail(f"Test 'test_designers_invalid_pagination' FAILED: {e}")
+
+# Test para búsquedas con caracteres especiales (la query debe ir codificada en la URL)
+def test_search_designers_special_characters(client):
+    """
+    Verifica que una búsqueda con '&' y espacios no rompe la query string.
+    """
+    search_term = "chanel & co"
+    try:
+        designers = client.search_designers(search_term)
+        assert isinstance(designers, list)
+        print(f"\nTest 'test_search_designers_special_characters' PASSED. Resultados: {len(designers)}")
+    except requests.exceptions.ConnectionError:
+        pytest.fail(f"No se pudo conectar con la API de Flask en {FLASK_API_URL}. Asegúrate de que esté ejecutándose.")
+    except Exception as e:
+        pytest.fail(f"Test 'test_search_designers_special_characters' FAILED: {e}")
+
 # Test para la integración con el LLM (Groq)
-def test_generate_text_with_llm():
+def test_generate_text_with_llm(client):
     """
     Verifica el endpoint /generate_text (POST) con un prompt simple para el LLM.
     Requiere que GROQ_API_KEY esté configurada y que el LLM responda.
@@ -214,10 +285,7 @@ def test_generate_text_with_llm():
         "prompt": "Dime un dato interesante sobre la moda."
     }
     try:
-        response = requests.post(f"{FLASK_API_URL}/generate_text", json=llm_prompt_data)
-        response.raise_for_status() # Lanza un error para 4xx/5xx
-        assert response.status_code == 200
-        response_json = response.json()
+        response_json = client.generate_text(llm_prompt_data["prompt"])
         assert "generated_text" in response_json
         assert isinstance(response_json["generated_text"], str)
         assert len(response_json["generated_text"]) > 10 # Asegura que la respuesta no esté vacía o sea muy corta
@@ -228,14 +296,12 @@ def test_generate_text_with_llm():
         pytest.fail(f"Test 'test_generate_text_with_llm' FAILED: {e}")
 
 # Verifica el registro de interacciones LLM en la base de datos
-def test_llm_interaction_logging():
+def test_llm_interaction_logging(client):
    
     initial_logs_count = 0
     try:
         # Obtener el número inicial de logs
-        response_initial = requests.get(f"{FLASK_API_URL}/logs")
-        response_initial.raise_for_status()
-        initial_logs = response_initial.json()
+        initial_logs = client.list_logs()
         initial_logs_count = len(initial_logs)
         print(f"\nTest 'test_llm_interaction_logging': Logs iniciales: {initial_logs_count}")
 
@@ -250,7 +316,7 @@ def test_llm_interaction_logging():
     }
     try:
         # Realizar una solicitud a /generate_text para generar un log
-        response_llm = requests.post(f"{FLASK_API_URL}/generate_text", json=llm_prompt_data)
+        response_llm = client.request("POST", "/generate_text", retry=False, json=llm_prompt_data)
         response_llm.raise_for_status() # Asegura que la llamada al LLM fue exitosa
         assert response_llm.status_code == 200
         print(f"Test 'test_llm_interaction_logging': Solicitud LLM enviada.")
@@ -259,9 +325,7 @@ def test_llm_interaction_logging():
         time.sleep(0.5)
 
         # Obtengo el número final de logs
-        response_final = requests.get(f"{FLASK_API_URL}/logs")
-        response_final.raise_for_status()
-        final_logs = response_final.json()
+        final_logs = client.list_logs()
         final_logs_count = len(final_logs)
         print(f"Test 'test_llm_interaction_logging': Logs finales: {final_logs_count}")
 
@@ -281,3 +345,78 @@ def test_llm_interaction_logging():
         pytest.fail(f"No se pudo conectar con la API de Flask en {FLASK_API_URL}. Asegúrate de que esté ejecutándose.")
     except Exception as e:
         pytest.fail(f"Test 'test_llm_interaction_logging' FAILED: {e}")
+
+# Test para la generación de texto en lote con el cliente síncrono
+def test_generate_many_with_llm(client):
+    """
+    Verifica que generate_many devuelve una respuesta por prompt y en el mismo orden.
+    Requiere que GROQ_API_KEY esté configurada.
+    """
+    prompts = ["Dime un color de moda.", "Dime un tejido de moda."]
+    try:
+        results = client.generate_many(prompts, max_workers=2)
+        assert len(results) == len(prompts)
+        assert all(isinstance(r.get("generated_text"), str) for r in results)
+        print(f"\nTest 'test_generate_many_with_llm' PASSED. Respuestas: {len(results)}")
+    except requests.exceptions.ConnectionError:
+        pytest.fail(f"No se pudo conectar con la API de Flask en {FLASK_API_URL}. Asegúrate de que esté ejecutándose.")
+    except Exception as e:
+        pytest.fail(f"Test 'test_generate_many_with_llm' FAILED: {e}")
+
+# Test para el cliente asíncrono
+def test_async_client_lists_designers(client):
+    """
+    Verifica que el cliente asíncrono devuelve los mismos diseñadores que el síncrono.
+    """
+    async def fetch_all():
+        async with AsyncDesignersClient(FLASK_API_URL) as async_client:
+            return [d async for d in async_client.iter_designers(page_size=2)]
+
+    try:
+        designers = asyncio.run(fetch_all())
+        assert [d["id"] for d in designers] == [d["id"] for d in client.list_designers()]
+        print(f"\nTest 'test_async_client_lists_designers' PASSED. Total diseñadores: {len(designers)}")
+    except requests.exceptions.ConnectionError:
+        pytest.fail(f"No se pudo conectar con la API de Flask en {FLASK_API_URL}. Asegúrate de que esté ejecutándose.")
+    except Exception as e:
+        pytest.fail(f"Test 'test_async_client_lists_designers' FAILED: {e}")
+
+# Test para las sesiones de conversación multi-turno
+def test_session_conversation(client):
+    """
+    Verifica que se puede crear una sesión, enviar dos mensajes y recuperar ambos turnos.
+    Requiere que GROQ_API_KEY esté configurada y que existan las tablas de sesiones.
+    """
+    try:
+        session_id = client.create_session()
+        first = client.send_message(session_id, "Mi diseñador favorito es Coco Chanel. Recuérdalo.")
+        assert first["session_id"] == session_id
+        second = client.send_message(session_id, "¿Cuál es mi diseñador favorito?")
+        # El contenido de la respuesta del LLM no es determinista; se comprueba que se guardan ambos turnos
+        assert second["generated_text"]
+
+        session = client.get_session(session_id)
+        assert [(t["user_message"], t["assistant_message"]) for t in session["turns"]] == [
+            ("Mi diseñador favorito es Coco Chanel. Recuérdalo.", first["generated_text"]),
+            ("¿Cuál es mi diseñador favorito?", second["generated_text"]),
+        ]
+        print(f"\nTest 'test_session_conversation' PASSED. Sesión: {session_id}")
+    except requests.exceptions.ConnectionError:
+        pytest.fail(f"No se pudo conectar con la API de Flask en {FLASK_API_URL}. Asegúrate de que esté ejecutándose.")
+    except Exception as e:
+        pytest.fail(f"Test 'test_session_conversation' FAILED: {e}")
+
+# Test para una sesión inexistente
+def test_session_not_found(client):
+    """
+    Verifica que /sessions/<id>/messages devuelve 404 para una sesión inexistente.
+    """
+    try:
+        response = client.request("POST", "/sessions/999999/messages", retry=False, json={"prompt": "Hola"})
+        assert response.status_code == 404
+        assert "Sesión no encontrada" in response.json().get("message", "")
+        print(f"\nTest 'test_session_not_found' PASSED. Código: {response.status_code}")
+    except requests.exceptions.ConnectionError:
+        pytest.fail(f"No se pudo conectar con la API de Flask en {FLASK_API_URL}. Asegúrate de que esté ejecutándose.")
+    except Exception as e:
+        pytest.fail(f"Test 'test_session_not_found' FAILED: {e}")
@@ -0,0 +1,142 @@
+import datetime
+import os
+from types import SimpleNamespace
+
+import pytest
+from flask import jsonify
+
+# Configuración sin servicios externos: sin clave de Groq y con una base de datos inalcanzable.
+# Se fija antes de importar app_async, que crea la aplicación Flask al importarse.
+os.environ["GROQ_API_KEY"] = ""
+os.environ["DB_URL"] = "postgresql://postgres@127.0.0.1:1/postgres"
+os.environ["DB_CONNECT_TIMEOUT"] = "1"
+os.environ["DB_POOL_TIMEOUT"] = "1"
+
+from starlette.testclient import TestClient
+
+import app_async
+
+# Estos tests no necesitan un servidor en marcha: usan el TestClient de Starlette
+# y comparan las respuestas con las de la aplicación Flask (test_client).
+
+
+@pytest.fixture
+def client():
+    with TestClient(app_async.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def flask_client():
+    return app_async.flask_app.test_client()
+
+
+class FakeAsyncGroq:
+    """Cliente AsyncGroq falso que devuelve siempre la misma respuesta."""
+
+    def __init__(self, content):
+        self.prompts = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self._content = content
+
+    async def _create(self, messages, model):
+        self.prompts.append(messages[-1]["content"])
+        message = SimpleNamespace(content=self._content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_generate_text_without_api_key(client, flask_client):
+    """
+    Sin GROQ_API_KEY /generate_text responde 503 con el mismo cuerpo que la versión Flask.
+    """
+    response = client.post("/generate_text", json={"prompt": "Hola"})
+    flask_response = flask_client.post("/generate_text", json={"prompt": "Hola"})
+    assert response.status_code == 503
+    assert flask_response.status_code == 503
+    assert response.content == flask_response.data
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_generate_text_missing_prompt(client, monkeypatch):
+    """
+    Verifica que /generate_text devuelve 400 si falta el prompt.
+    """
+    monkeypatch.setattr(app_async, "get_groq_client", lambda: FakeAsyncGroq("respuesta"))
+    response = client.post("/generate_text", json={})
+    assert response.status_code == 400
+    assert response.json() == {"error": "Parámetro 'prompt' requerido en el cuerpo de la solicitud."}
+
+
+def test_generate_text_returns_llm_response(client, monkeypatch):
+    """
+    Verifica que /generate_text devuelve la respuesta del LLM aunque no se pueda registrar en la base de datos.
+    """
+    fake_groq = FakeAsyncGroq("Coco Chanel fundó la maison en 1910.")
+    monkeypatch.setattr(app_async, "get_groq_client", lambda: fake_groq)
+    response = client.post("/generate_text", json={"prompt": "¿Quién fundó Chanel?"})
+    assert response.status_code == 200
+    assert response.json() == {"generated_text": "Coco Chanel fundó la maison en 1910."}
+    assert fake_groq.prompts == ["¿Quién fundó Chanel?"]
+
+
+@pytest.mark.parametrize("query", ["limit=abc", "limit=-1", "offset=abc", "offset=-5"])
+def test_logs_invalid_pagination(client, flask_client, query):
+    """
+    Verifica que /logs rechaza los parámetros de paginación no válidos igual que la versión Flask.
+    """
+    response = client.get(f"/logs?{query}")
+    flask_response = flask_client.get(f"/logs?{query}")
+    assert response.status_code == 400
+    assert flask_response.status_code == 400
+    assert response.content == flask_response.data
+
+
+def test_logs_without_database(client):
+    """
+    Sin base de datos /logs responde 500 en lugar de quedarse sin pool para siempre.
+    """
+    response = client.get("/logs")
+    assert response.status_code == 500
+    assert response.json() == {"error": "No se pudo conectar a la base de datos"}
+
+
+def test_json_response_matches_jsonify():
+    """
+    Verifica que FlaskJSONResponse serializa igual que jsonify (orden de claves, fechas y caracteres no ASCII).
+    """
+    payload = [{
+        "user_prompt": "¿Qué es la alta costura?",
+        "timestamp": datetime.datetime(2024, 5, 17, 10, 30, 15),
+        "id": 7,
+        "ip_address": None,
+    }]
+    with app_async.flask_app.app_context():
+        expected = jsonify(payload).get_data()
+    assert app_async.FlaskJSONResponse(payload).body == expected
+    assert b"Fri, 17 May 2024 10:30:15 GMT" in expected
+
+
+def test_flask_routes_are_mounted(client):
+    """
+    Verifica que las rutas que no son asíncronas se delegan a la aplicación Flask.
+    """
+    response = client.get("/healthz")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+    response = client.get("/")
+    assert response.status_code == 200
+    assert "Inicio de la API de designers" in response.text
+
+    response = client.get("/designers")
+    assert response.status_code == 500
+    assert response.json() == {"error": "No se pudo conectar a la base de datos"}
+
+
+def test_readiness_requires_database(client):
+    """
+    Sin base de datos /readyz del modo asíncrono responde 503 'warming_up'.
+    """
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json() == {"status": "warming_up"}
@@ -0,0 +1,129 @@
+import sessions
+from sessions import ConversationState, SessionCache, build_messages, estimate_tokens, turns_to_summarize
+
+# Tests deterministas de la lógica de sesiones: no necesitan la API, la base de datos ni el LLM.
+
+# Cada turno ocupa 22 tokens estimados (40 caracteres por mensaje -> 11 tokens)
+TURN = ("u" * 40, "a" * 40)
+TURN_TOKENS = 22
+
+
+def window_tokens(turns):
+    return sum(estimate_tokens(user_message) + estimate_tokens(assistant_message) for user_message, assistant_message in turns)
+
+
+def test_budget_that_fits_summarizes_nothing():
+    """
+    Si el resumen, los turnos y el prompt caben en el presupuesto no se resume ningún turno.
+    """
+    state = ConversationState(1, turns=[TURN] * 3)
+    assert turns_to_summarize(state, "Hola", token_budget=1000) == 0
+    # Justo en el límite también cabe: 3 turnos + prompt + resumen vacío
+    budget = 3 * TURN_TOKENS + estimate_tokens("Hola") + estimate_tokens(None)
+    assert turns_to_summarize(state, "Hola", token_budget=budget) == 0
+
+
+def test_overflowing_budget_halves_the_window():
+    """
+    Si el contexto no cabe, se resumen los turnos más antiguos hasta que la ventana ocupa como
+    máximo la mitad del presupuesto disponible.
+    """
+    state = ConversationState(1, turns=[TURN] * 10)
+    budget = 100
+    available = budget - estimate_tokens(None) - estimate_tokens("Hola")
+
+    count = turns_to_summarize(state, "Hola", token_budget=budget)
+
+    remaining = state.turns[count:]
+    assert count == 8
+    assert window_tokens(remaining) <= available // 2
+    # Con un turno más ya no cabría en la mitad del presupuesto
+    assert window_tokens(state.turns[count - 1:]) > available // 2
+
+
+def test_summary_counts_towards_the_budget():
+    """
+    El resumen previo ocupa parte del presupuesto, así que deja menos sitio para los turnos.
+    """
+    turns = [TURN] * 4
+    without_summary = ConversationState(1, turns=turns)
+    with_summary = ConversationState(1, summary="s" * 200, summarized_turns=6, turns=turns)
+    assert turns_to_summarize(without_summary, "Hola", token_budget=100) == 0
+    assert turns_to_summarize(with_summary, "Hola", token_budget=100) > 0
+
+
+def test_prompt_larger_than_budget():
+    """
+    Si el prompt por sí solo supera el presupuesto se resumen todos los turnos, y sin turnos no hay nada que resumir.
+    """
+    prompt = "p" * 1000
+    state = ConversationState(1, turns=[TURN] * 5)
+    assert turns_to_summarize(state, prompt, token_budget=50) == 5
+    assert turns_to_summarize(ConversationState(1), prompt, token_budget=50) == 0
+
+
+def test_single_oversized_turn_is_summarized():
+    """
+    Un único turno que no cabe en el presupuesto pasa al resumen.
+    """
+    state = ConversationState(1, turns=[("u" * 1000, "a" * 1000)])
+    assert turns_to_summarize(state, "Hola", token_budget=100) == 1
+
+
+def test_window_start():
+    """
+    Verifica que _window_start recorre los turnos desde el más reciente.
+    """
+    turns = [TURN] * 4
+    assert sessions._window_start(turns, 4 * TURN_TOKENS) == 0
+    assert sessions._window_start(turns, 2 * TURN_TOKENS + 5) == 2
+    assert sessions._window_start(turns, TURN_TOKENS - 1) == 4
+    assert sessions._window_start([], 100) == 0
+
+
+def test_build_messages_order():
+    """
+    Verifica que los mensajes se envían en orden: resumen, turnos recientes y nuevo prompt.
+    """
+    state = ConversationState(1, summary="Le gusta Chanel.", summarized_turns=2, turns=[("Hola", "¡Hola!"), ("¿Y Dior?", "Fundada en 1946.")])
+    messages = build_messages(state, "¿Y Balenciaga?")
+    assert [message["role"] for message in messages] == ["system", "user", "assistant", "user", "assistant", "user"]
+    assert "Le gusta Chanel." in messages[0]["content"]
+    assert [message["content"] for message in messages[1:]] == ["Hola", "¡Hola!", "¿Y Dior?", "Fundada en 1946.", "¿Y Balenciaga?"]
+
+    assert build_messages(ConversationState(1), "Hola") == [{"role": "user", "content": "Hola"}]
+
+
+def test_conversation_state_copy_is_independent():
+    """
+    Modificar una copia no afecta al estado guardado en la caché.
+    """
+    state = ConversationState(1, summary="resumen", summarized_turns=2, turns=[TURN])
+    copy = state.copy()
+    copy.turns.append(TURN)
+    copy.summarized_turns += 1
+    assert state.turns == [TURN]
+    assert state.turn_count == 3
+    assert copy.turn_count == 5
+
+
+def test_session_cache_evicts_least_recently_used():
+    """
+    La caché descarta la conversación usada hace más tiempo, y get() cuenta como uso.
+    """
+    cache = SessionCache(max_size=2)
+    cache.put(ConversationState(1))
+    cache.put(ConversationState(2))
+    assert cache.get(1) is not None
+    cache.put(ConversationState(3))
+
+    assert cache.get(2) is None
+    assert cache.get(1).session_id == 1
+    assert cache.get(3).session_id == 3
+
+    cache.put(ConversationState(4))
+    assert cache.get(1) is None
+
+    cache.discard(3)
+    assert cache.get(3) is None
+    assert cache.get(4).session_id == 4